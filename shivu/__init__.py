@@ -1,16 +1,29 @@
+import atexit
 import logging
 import asyncio
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pyrogram import Client
 from telegram.ext import Application
 from motor.motor_asyncio import AsyncIOMotorClient
 
 # ---------------- LOGGING ---------------- #
 
-logging.basicConfig(
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-    handlers=[logging.FileHandler("log.txt"), logging.StreamHandler()],
-    level=logging.INFO,
-)
+# Handlers write from a background thread, so logging calls never block
+# the event loop on file or terminal I/O
+log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+log_handlers = [logging.FileHandler("log.txt"), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logging.basicConfig(handlers=[log_queue_handler], level=logging.INFO)
 
 logging.getLogger("apscheduler").setLevel(logging.ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -38,7 +51,28 @@ BOT_USERNAME = Config.BOT_USERNAME
 
 # ---------------- TELEGRAM APP ---------------- #
 
-application = Application.builder().token(TOKEN).build()
+# Async cleanups modules register for shutdown (shared HTTP sessions etc.)
+shutdown_callbacks = []
+
+async def run_shutdown_callbacks(_application):
+    """
+    Run every registered cleanup once PTB has shut down
+    """
+    for callback in shutdown_callbacks:
+        try:
+            await callback()
+        except Exception:
+            LOGGER.exception("Shutdown cleanup failed")
+
+# Bot API calls (sends, edits, deletes) share multiplexed HTTP/2 connections;
+# getUpdates long polling keeps its own HTTP/1.1 connection
+application = (
+    Application.builder()
+    .token(TOKEN)
+    .http_version("2")
+    .post_shutdown(run_shutdown_callbacks)
+    .build()
+)
 
 # ---------------- PYROGRAM ---------------- #
 
@@ -51,7 +85,16 @@ shivuu = Client(
 
 # ---------------- DATABASE ---------------- #
 
-mongo_client = AsyncIOMotorClient(MONGO_URL)
+# Explicit pool bounds: keep a few warm connections for command bursts and
+# fail fast instead of queueing forever when the pool is exhausted
+mongo_client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=50,
+    minPoolSize=10,
+    maxIdleTimeMS=60_000,
+    waitQueueTimeoutMS=5_000,
+    serverSelectionTimeoutMS=5_000,
+)
 db = mongo_client["Character_catcher"]
 
 collection = db["anime_characters_lol"]
@@ -100,6 +143,7 @@ mongo_url = MONGO_URL
 __all__ = [
     "application",
     "create_background_task",
+    "shutdown_callbacks",
     "collection",
     "db",
     "TOKEN",
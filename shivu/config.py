@@ -1,6 +1,6 @@
 import os
 import sys
-from typing import List
+from typing import FrozenSet, List
 
 
 class Config:
@@ -19,11 +19,12 @@ class Config:
     
     # Owner and Sudo Users
     OWNER_ID: int = int(os.getenv("OWNER_ID", "7818323042"))
-    SUDO_USERS: List[int] = [
+    # frozenset so the permission checks are hash lookups
+    SUDO_USERS: FrozenSet[int] = frozenset(
         int(user_id.strip())
         for user_id in os.getenv("SUDO_USERS", "7818323042,8453236527").split(",")
         if user_id.strip().isdigit()
-    ]
+    )
     
     # Group and Channel IDs
     GROUP_ID: int = int(os.getenv("GROUP_ID", "-1003129952280"))
@@ -84,7 +85,7 @@ class Config:
         
         # Add OWNER_ID to SUDO_USERS if not already present
         if cls.OWNER_ID not in cls.SUDO_USERS:
-            cls.SUDO_USERS.append(cls.OWNER_ID)
+            cls.SUDO_USERS = cls.SUDO_USERS | {cls.OWNER_ID}
 
 
 class Production(Config):
@@ -1,4 +1,5 @@
 import asyncio
+import re
 import time
 import logging
 from datetime import timedelta
@@ -21,6 +22,9 @@ OWNER_ID = 8420981179
 # Broadcast control flag (for cancel feature)
 broadcast_running = {'status': False, 'cancel': False}
 
+# BadRequest texts meaning the chat is gone (deleted account or invalid chat ID)
+INVALID_CHAT_ERROR = re.compile(r"chat not found|user not found|deactivated", re.IGNORECASE)
+
 
 def to_small_caps(text: str) -> str:
     """Convert text to small caps."""
@@ -346,8 +350,7 @@ async def broadcast(update: Update, context: CallbackContext) -> None:
 
             except BadRequest as e:
                 # Deleted account or invalid chat ID
-                error_msg = str(e).lower()
-                if any(x in error_msg for x in ["chat not found", "user not found", "deactivated"]):
+                if INVALID_CHAT_ERROR.search(e.message):
                     stats['failed'] += 1
                     logger.debug(f"❌ Invalid chat: {chat_id}")
                 else:
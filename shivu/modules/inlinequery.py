@@ -37,13 +37,10 @@ def to_small_caps(text):
     return ''.join(small_caps_map.get(ch, ch) for ch in str(text))
 
 # --- Indexing ---
-db.characters.create_index([('id', ASCENDING)])
-db.characters.create_index([('anime', ASCENDING)])
-db.characters.create_index([('img_url', ASCENDING)])
-
-db.user_collection.create_index([('characters.id', ASCENDING)])
-db.user_collection.create_index([('characters.name', ASCENDING)])
-db.user_collection.create_index([('characters.img_url', ASCENDING)])
+# Only the keys the lookups below filter on; name/img_url indexes served no query
+collection.create_index([('id', ASCENDING)])
+collection.create_index([('anime', ASCENDING)])
+user_collection.create_index([('characters.id', ASCENDING)])
 
 # --- Cache Fixing ---
 # Global cache ko 10 ghante se ghata kar 2 minute (120s) kar diya taaki deleted characters jaldi update hon
@@ -1,6 +1,7 @@
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 import logging
+import re
 
 from shivu import shivuu, collection, user_collection
 
@@ -47,13 +48,17 @@ def to_small_caps(text):
 # Storage for sfind pagination
 sfind_sessions = {}  # {user_id: {'characters': [...], 'page': 0}}
 
+# Fields each read actually renders, so full documents are not shipped
+SFIND_PROJECTION = {'_id': 0, 'id': 1, 'name': 1, 'anime': 1, 'rarity': 1}
+SCHECK_PROJECTION = {'_id': 0, 'id': 1, 'name': 1, 'anime': 1, 'rarity': 1, 'img_url': 1}
+
 
 async def get_character_count(character_id):
     """Count how many users have this character"""
     try:
         # Count users who have this character ID in their collection
         count = 0
-        async for user in user_collection.find({'characters.id': character_id}):
+        async for user in user_collection.find({'characters.id': character_id}, {'characters.id': 1}):
             # Count how many times this character appears in user's collection
             user_chars = user.get('characters', [])
             for char in user_chars:
@@ -71,7 +76,10 @@ async def get_top_grabbers(character_id, limit=10):
         top_users = []
         
         # Find all users who have this character
-        async for user in user_collection.find({'characters.id': character_id}):
+        async for user in user_collection.find(
+            {'characters.id': character_id},
+            {'id': 1, 'username': 1, 'first_name': 1, 'characters.id': 1}
+        ):
             user_id = user.get('id')
             username = user.get('username', 'Unknown')
             first_name = user.get('first_name', 'User')
@@ -202,7 +210,7 @@ async def scheck_command(client, message):
         character_id = message.command[1]
         
         # Search for character in database
-        character = await collection.find_one({'id': character_id})
+        character = await collection.find_one({'id': character_id}, SCHECK_PROJECTION)
         
         if not character:
             await message.reply_text(
@@ -278,18 +286,17 @@ async def sfind_command(client, message):
         # Get search query (support multiple words)
         search_query = ' '.join(message.command[1:])
         
-        # Search in database (case-insensitive search for first_name, last_name, or name)
-        characters = []
-        search_regex = {'$regex': search_query, '$options': 'i'}
-        
-        async for char in collection.find({
+        # Case-insensitive regex over first_name, last_name, or name. The query is
+        # escaped so user input is matched literally and cannot inject a
+        # pathological pattern.
+        search_regex = {'$regex': re.escape(search_query), '$options': 'i'}
+        characters = await collection.find({
             '$or': [
                 {'name': search_regex},
                 {'first_name': search_regex},
                 {'last_name': search_regex}
             ]
-        }):
-            characters.append(char)
+        }, SFIND_PROJECTION).to_list(length=None)
         
         if not characters:
             await message.reply_text(
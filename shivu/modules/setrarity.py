@@ -77,6 +77,9 @@ RARITY_MAP = {
     15: "🧬 ʜʏʙʀɪᴅ",
 }
 
+# "Available Rarities" listing, built once since the map never changes
+RARITY_LIST_TEXT = "\n".join(f"{k}: {v}" for k, v in RARITY_MAP.items())
+
 # Authorization check
 def is_authorized(user_id: int) -> bool:
     """Check if user is owner or sudo"""
@@ -131,9 +134,8 @@ async def set_on(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     # Check if rarity number is provided
     if not context.args:
-        rarity_list = "\n".join([f"{k}: {v}" for k, v in RARITY_MAP.items()])
         await update.message.reply_text(
-            to_small_caps(f"❌ Please provide a rarity number.\n\nUsage: /set_on <rarity_number>\n\nAvailable Rarities:\n{rarity_list}")
+            to_small_caps(f"❌ Please provide a rarity number.\n\nUsage: /set_on <rarity_number>\n\nAvailable Rarities:\n{RARITY_LIST_TEXT}")
         )
         return
     
@@ -196,9 +198,8 @@ async def set_off(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     # Check if rarity number is provided
     if not context.args:
-        rarity_list = "\n".join([f"{k}: {v}" for k, v in RARITY_MAP.items()])
         await update.message.reply_text(
-            to_small_caps(f"❌ Please provide a rarity number.\n\nUsage: /set_off <rarity_number>\n\nAvailable Rarities:\n{rarity_list}")
+            to_small_caps(f"❌ Please provide a rarity number.\n\nUsage: /set_off <rarity_number>\n\nAvailable Rarities:\n{RARITY_LIST_TEXT}")
         )
         return
     
@@ -9,12 +9,16 @@ from pyrogram.types import InputMediaPhoto
 import os
 from pyrogram import Client, filters
 from pyrogram.types import Message
-from pymongo import ReturnDocument, UpdateOne
+from pymongo import ReturnDocument, UpdateOne, WriteConcern
 import urllib.request
 import random
+import itertools
 import aiohttp
 import asyncio
-from shivu import UPDATE_CHAT, SUPPORT_CHAT, required_group_id, PHOTO_URL, OWNER_ID, PARTNER
+import json
+from contextlib import contextmanager
+from cachetools import TTLCache
+from shivu import UPDATE_CHAT, SUPPORT_CHAT, required_group_id, PHOTO_URL, OWNER_ID, PARTNER, LOGGER, create_background_task, shutdown_callbacks
 from shivu import (
     collectionps as collection,
     top_global_groups_collectionps as top_global_groups_collection,
@@ -33,20 +37,28 @@ from shivu import (
     chat_dataps as chat_data,
 )
 
+# Prefer orjson for decoding image-host API responses, stdlib json otherwise
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Owner and partners, built once at import instead of on every message
+SUDO_USER_IDS = frozenset([OWNER_ID] + (PARTNER if PARTNER else []))
+
 # Define filters if not already imported
 def sudo_filter_func(_, __, message):
     """Filter for sudo users (owner and partners)"""
     if not message.from_user:
         return False
-    sudo_users = [OWNER_ID] + (PARTNER if PARTNER else [])
-    return message.from_user.id in sudo_users
+    return message.from_user.id in SUDO_USER_IDS
 
 def uploader_filter_func(_, __, message):
     """Filter for uploader users (same as sudo for now)"""
     if not message.from_user:
         return False
-    sudo_users = [OWNER_ID] + (PARTNER if PARTNER else [])
-    return message.from_user.id in sudo_users
+    return message.from_user.id in SUDO_USER_IDS
 
 sudo_filter = filters.create(sudo_filter_func)
 uploader_filter = filters.create(uploader_filter_func)
@@ -102,29 +114,114 @@ RARITY_MAP = {
     15: (15, "🧬 ʜʏʙʀɪᴅ"),
 }
 
+# Rarity display text keyed by the number as typed in a command, so validating
+# an argument is a single lookup
+RARITY_TEXT_BY_ARG = {str(number): text for number, (_, text) in RARITY_MAP.items()}
+
+# Reply texts shared across handlers
+PROCESSING_TEXT = "<ᴘʀᴏᴄᴇꜱꜱɪɴɢ>...."
+UPDATING_IMAGE_TEXT = "<ᴜᴘᴅᴀᴛɪɴɢ ɪᴍᴀɢᴇ...>"
+CHARACTER_NOT_FOUND_TEXT = 'Character not found.'
+INVALID_RARITY_TEXT = 'Invalid rarity. Please use a number between 1 and 15.'
+AMV_RARITY = "🎗️ 𝘼𝙈𝙑 𝙀𝙙𝙞𝙩𝙞𝙤𝙣"
+VIDEO_ADDED_TEXT = "✅ Video character added successfully."
+UPLOAD_FAILED_TEXT = "❌ Character Upload Unsuccessful. Error: "
+VIDEO_UPLOAD_FAILED_TEXT = "❌ Failed to upload character. Error: "
+IMAGE_UPDATE_FAILED_TEXT = "❌ Image update failed. Error: "
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.gif')
+
+# Channel post caption shared by /upload and /updateimg
+CHARACTER_CAPTION = (
+    "{header}\n"
+    "\n━━━━━━━━━━━━━━━━━━\n"
+    "🔹 **Name:** {name}\n"
+    "🔸 **Anime:** {anime}\n"
+    "🔹 **ID:** {id}\n"
+    "🔸 **Rarity:** {rarity}\n"
+    "{action} by [{first_name}](tg://user?id={user_id})\n"
+    "\n━━━━━━━━━━━━━━━━━━\n"
+)
+
+# Photos up to this size are downloaded into memory instead of a temp file
+MAX_IN_MEMORY_SIZE = 8 * 1024 * 1024
 
 # Global set to keep track of active IDs and a lock for safe access
 active_ids = set()
 id_lock = asyncio.Lock()
 
+# Fields the edit commands read from a character document
+CHARACTER_PROJECTION = {'_id': 0, 'id': 1, 'name': 1, 'anime': 1, 'rarity': 1, 'img_url': 1}
+# Fields /f shows, including the video of AMV characters
+CHECK_PROJECTION = {**CHARACTER_PROJECTION, 'vid_url': 1}
+
+# Recently read character documents keyed by ID, for back-to-back admin edits.
+# Every write in this module drops or refreshes the affected entries.
+character_cache = TTLCache(maxsize=1000, ttl=60)
+
+# /delete and its cascade only need the primary's ack, not a journal flush
+delete_collection = collection.with_options(write_concern=WriteConcern(w=1, j=False))
+delete_user_collection = user_collection.with_options(write_concern=WriteConcern(w=1, j=False))
+
+# Shared HTTP session for the image hosts, created lazily inside the running loop
+http_session = None
+
+# Hosted image URLs keyed by Telegram file_unique_id, so re-sent media is not re-uploaded
+hosted_url_cache = TTLCache(maxsize=1000, ttl=6 * 60 * 60)
+
+async def get_http_session():
+    """
+    Return the shared aiohttp session, creating it on first use
+    """
+    global http_session
+    if http_session is None or http_session.closed:
+        # No global connection cap (uploads are few and already sequential per command);
+        # keep connections and DNS lookups warm between uploads instead
+        connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=600, keepalive_timeout=75)
+        http_session = aiohttp.ClientSession(connector=connector)
+    return http_session
+
+async def close_http_session():
+    """
+    Close the shared aiohttp session and its connector on shutdown
+    """
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+shutdown_callbacks.append(close_http_session)
+
+@contextmanager
+def open_media(source):
+    """
+    Yield a readable file and its name for a downloaded path or in-memory buffer
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            yield file, os.path.basename(source)
+    else:
+        # In-memory downloads are rewound so every fallback reads them from the start
+        source.seek(0)
+        yield source, source.name
+
 async def upload_to_imgbb(file_path, api_key=IMGBB_API_KEY):
     """
     Upload image to imgBB (primary upload service)
     """
     url = "https://api.imgbb.com/1/upload"
     
-    # Read the file
-    with open(file_path, "rb") as file:
-        file_data = file.read()
-    
-    # Create form data
-    data = aiohttp.FormData()
-    data.add_field('key', api_key)
-    data.add_field('image', file_data, filename=os.path.basename(file_path))
-    
-    async with aiohttp.ClientSession() as session:
+    # Stream the file into the request instead of reading it into memory first
+    with open_media(file_path) as (file, file_name):
+        # Create form data
+        data = aiohttp.FormData()
+        data.add_field('key', api_key)
+        data.add_field('image', file, filename=file_name)
+        
+        session = await get_http_session()
         async with session.post(url, data=data) as response:
-            result = await response.json()
+            result = await response.json(loads=json_loads)
             
             if response.status == 200 and result.get("success"):
                 return result["data"]["url"]
@@ -132,36 +229,20 @@ async def upload_to_imgbb(file_path, api_key=IMGBB_API_KEY):
                 error_msg = result.get('error', {}).get('message', 'Unknown error')
                 raise Exception(f"ImgBB upload fbailed: {error_msg}")
 
-async def upload_to_telegraph(file_path):
-    """
-    Upload image to Telegraph (fallback option)
-    """
-    try:
-        # Use the synchronous telegraph upload function
-        result = upload_file(file_path)
-        if isinstance(result, list) and len(result) > 0:
-            return f"https://telegra.ph{result[0]}"
-        else:
-            raise Exception("Telegraph upload failed")
-    except Exception as e:
-        raise Exception(f"Telegraph upload error: {str(e)}")
-
 async def upload_to_catbox(file_path):
     """
-    Upload image to Catbox (secondary fallback option)
+    Upload image to Catbox (fallback option)
     """
     url = "https://catbox.moe/user/api.php"
     
-    # Read the file
-    with open(file_path, "rb") as file:
-        file_data = file.read()
-    
-    # Create form data
-    data = aiohttp.FormData()
-    data.add_field('reqtype', 'fileupload')
-    data.add_field('fileToUpload', file_data, filename=os.path.basename(file_path))
-    
-    async with aiohttp.ClientSession() as session:
+    # Stream the file into the request instead of reading it into memory first
+    with open_media(file_path) as (file, file_name):
+        # Create form data
+        data = aiohttp.FormData()
+        data.add_field('reqtype', 'fileupload')
+        data.add_field('fileToUpload', file, filename=file_name)
+        
+        session = await get_http_session()
         async with session.post(url, data=data) as response:
             if response.status == 200:
                 return (await response.text()).strip()
@@ -174,19 +255,18 @@ async def upload_image_with_fallback(file_path):
     """
     services = [
         upload_to_imgbb,  # Primary - imgBB
-        upload_to_telegraph,  # First fallback - Telegraph
-        upload_to_catbox,  # Second fallback - Catbox
+        upload_to_catbox,  # Fallback - Catbox
     ]
     
     last_error = None
     for service in services:
         try:
-            print(f"Trying {service.__name__}...")
+            LOGGER.info("Trying %s...", service.__name__)
             url = await service(file_path)
-            print(f"Success with {service.__name__}: {url}")
+            LOGGER.info("Success with %s: %s", service.__name__, url)
             return url
         except Exception as e:
-            print(f"Failed with {service.__name__}: {str(e)}")
+            LOGGER.warning("Failed with %s: %s", service.__name__, e)
             last_error = e
             continue
     
@@ -194,59 +274,207 @@ async def upload_image_with_fallback(file_path):
 
 
 
-def check_file_size(file_path, max_size_mb=30):
+def normalize_name(text):
     """
-    Check if file size is within limits
+    Turn a hyphenated command argument into a display name (muzan-kibutsuji -> Muzan Kibutsuji)
+    """
+    return text.replace('-', ' ').title()
+
+def character_caption(header, name, anime, character_id, rarity, action, user):
+    """
+    Fill the channel caption template for a character post
+    """
+    return CHARACTER_CAPTION.format(
+        header=header, name=name, anime=anime, id=character_id, rarity=rarity,
+        action=action, first_name=user.first_name, user_id=user.id
+    )
+
+def parse_upload_args(args):
+    """
+    Extract (name, anime, rarity_text) from /upload's command arguments.
+    Raises ValueError carrying the reply text when the rarity is invalid.
+    """
+    rarity_text = RARITY_TEXT_BY_ARG.get(args[3])
+    if rarity_text is None:
+        if not args[3].isdigit():
+            raise ValueError("Rarity must be a number.")
+        raise ValueError("Invalid rarity value. Please use a valid rarity number.")
+    
+    return normalize_name(args[1]), normalize_name(args[2]), rarity_text
+
+def is_video_media(media):
+    """
+    Check whether a replied photo/document should be posted as a video
+    """
+    file_name = getattr(media, 'file_name', None) or ''
+    mime_type = getattr(media, 'mime_type', None) or ''
+    return file_name.lower().endswith(VIDEO_EXTENSIONS) or mime_type.startswith('video/')
+
+async def host_reply_media(reply):
+    """
+    Download and host the replied media, reusing the URL if it was hosted before.
+    Returns (image_url, path); path is None when a cached URL was reused or
+    the photo was hosted straight from memory.
+    """
+    media = reply.photo or reply.document
+    image_url = hosted_url_cache.get(media.file_unique_id)
+    if image_url:
+        return image_url, None
+
+    # Telegram reports the size up front, reject oversized media before downloading
+    if media.file_size:
+        check_size_limit(media.file_size)
+
+    # Small photos skip the temp file write, re-read and removal
+    if reply.photo and media.file_size and media.file_size <= MAX_IN_MEMORY_SIZE:
+        buffer = await reply.download(in_memory=True)
+        image_url = await upload_image_with_fallback(buffer)
+        hosted_url_cache[media.file_unique_id] = image_url
+        return image_url, None
+
+    path = await reply.download()
+    try:
+        await asyncio.to_thread(check_file_size, path)
+        # Upload image with fallback (imgBB as primary)
+        image_url = await upload_image_with_fallback(path)
+    except Exception:
+        await remove_file(path)
+        raise
+
+    hosted_url_cache[media.file_unique_id] = image_url
+    return image_url, path
+
+async def remove_file(path):
+    """
+    Delete a downloaded file without blocking the event loop
+    """
+    if path and await asyncio.to_thread(os.path.exists, path):
+        await asyncio.to_thread(os.remove, path)
+
+async def send_to_channel(client, chat_id, media_url, fallback, is_video, caption):
+    """
+    Post media to a channel by its hosted URL, falling back to the local file or file_id
+    """
+    try:
+        if is_video:
+            return await client.send_video(chat_id=chat_id, video=media_url, caption=caption)
+        return await client.send_photo(chat_id=chat_id, photo=media_url, caption=caption)
+    except:
+        # Fallback to sending the original media if URL doesn't work
+        if is_video:
+            return await client.send_video(chat_id=chat_id, video=fallback, caption=caption)
+        return await client.send_photo(chat_id=chat_id, photo=fallback, caption=caption)
+
+async def withdraw_post(post):
+    """
+    Delete a channel post for a character that is not being added, logging
+    failures so they don't mask the error that caused the withdrawal
+    """
+    try:
+        await post.delete()
+    except Exception:
+        LOGGER.exception("Failed to withdraw the channel post")
+
+async def post_image_update(client, image_url, path, media, caption):
+    """
+    Post an image update to the channel, then remove the downloaded file
+    """
+    try:
+        await send_to_channel(
+            client, -1003295207951, image_url, path or media.file_id, is_video_media(media), caption
+        )
+    except Exception:
+        LOGGER.exception("Failed to post the image update to the channel")
+    finally:
+        await remove_file(path)
+
+async def get_character(character_id):
+    """
+    Fetch a character by ID, serving repeated lookups from a short-lived cache.
+    Only for display; write decisions must not rely on the cached copy.
+    """
+    character = character_cache.get(character_id)
+    if character is None:
+        character = await collection.find_one({'id': character_id}, CHARACTER_PROJECTION)
+        if character:
+            character_cache[character_id] = character
+    return character
+
+async def set_character_field(character_id, field, value):
+    """
+    Atomically set a character field, matching only when the value actually changes.
+    Returns the updated document, or None when nothing was written.
+    """
+    updated = await collection.find_one_and_update(
+        {'id': character_id, field: {'$ne': value}},
+        {'$set': {field: value}},
+        projection=CHARACTER_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    if updated:
+        # The post-update document is exactly what get_character would cache
+        character_cache[character_id] = updated
+    return updated
+
+async def character_exists(character_id):
+    """
+    Check the database (not the cache) for a character ID
+    """
+    return await collection.count_documents({'id': character_id}, limit=1) > 0
+
+async def update_user_characters(character_id, fields):
+    """
+    Apply field changes to every owned copy of a character in one update_many
+    """
+    await user_collection.update_many(
+        {'characters.id': character_id},
+        {'$set': {f'characters.$[char].{key}': value for key, value in fields.items()}},
+        array_filters=[{'char.id': character_id}]
+    )
+
+def check_size_limit(file_size, max_size_mb=30):
+    """
+    Check if a size in bytes is within limits
     """
-    file_size = os.path.getsize(file_path)
     if file_size > max_size_mb * 1024 * 1024:
         raise Exception(f"File size ({file_size/1024/1024:.2f} MB) exceeds the {max_size_mb} MB limit.")
     return True
 
+def check_file_size(file_path, max_size_mb=30):
+    """
+    Check if file size is within limits
+    """
+    return check_size_limit(os.path.getsize(file_path), max_size_mb)
+
+async def next_free_id():
+    """
+    Lowest ID that is neither stored nor reserved by an upload in progress.
+    Callers must hold id_lock.
+    """
+    # Only the IDs are needed, fetched from the id index as a set
+    ids = set(await collection.distinct('id'))
+
+    # At most len(ids) + len(active_ids) + 1 candidates are tried
+    for i in itertools.count(1):
+        candidate_id = str(i).zfill(2)
+        if candidate_id not in ids and candidate_id not in active_ids:
+            return candidate_id
+
 async def find_available_id():
     """
     Find the next available ID for a character
     """
     async with id_lock:
-        cursor = collection.find().sort('id', 1)
-        ids = [doc['id'] for doc in await cursor.to_list(length=None)]
-        
-        # Handle case where no documents exist
-        if not ids:
-            candidate_id = "01"
-            active_ids.add(candidate_id)
-            return candidate_id
-        
-        # Convert to integers for proper comparison
-        int_ids = [int(id) for id in ids]
-        
-        for i in range(1, max(int_ids) + 2):
-            candidate_id = str(i).zfill(2)
-            if candidate_id not in ids and candidate_id not in active_ids:
-                active_ids.add(candidate_id)
-                return candidate_id
-        return str(max(int_ids) + 1).zfill(2)
+        candidate_id = await next_free_id()
+        active_ids.add(candidate_id)
+        return candidate_id
 
 async def find_available_ids():
     """
     Find available IDs without reserving them
     """
     async with id_lock:
-        cursor = collection.find().sort('id', 1)
-        ids = [doc['id'] for doc in await cursor.to_list(length=None)]
-        
-        # Handle case where no documents exist
-        if not ids:
-            return "01"
-        
-        # Convert to integers for proper comparison
-        int_ids = [int(id) for id in ids]
-        
-        for i in range(1, max(int_ids) + 2):
-            candidate_id = str(i).zfill(2)
-            if candidate_id not in ids and candidate_id not in active_ids:
-                return candidate_id
-        return str(max(int_ids) + 1).zfill(2)
+        return await next_free_id()
 
 @shivuu.on_message(filters.command(["uid"]) & uploader_filter)
 async def ulo(client, message):
@@ -266,39 +494,57 @@ async def ul(client, message):
         await message.reply_text("Please reply to a photo or document.")
         return
         
-    args = message.text.split()
+    # Arguments are already parsed by the command filter
+    args = message.command
     if len(args) != 4:
         await client.send_message(chat_id=message.chat.id, text=WRONG_FORMAT_TEXT)
         return
     
-    # Extract character details from the command arguments
-    character_name = args[1].replace('-', ' ').title()
-    anime = args[2].replace('-', ' ').title()
-    
     try:
-        rarity = int(args[3])
-    except ValueError:
-        await message.reply_text("Rarity must be a number.")
-        return
-    
-    # Validate rarity value
-    if rarity not in RARITY_MAP:
-        await message.reply_text("Invalid rarity value. Please use a valid rarity number.")
+        character_name, anime, rarity_text = parse_upload_args(args)
+    except ValueError as e:
+        await message.reply_text(str(e))
         return
     
-    rarity_text = RARITY_MAP[rarity][1]  # Get the text from tuple
     available_id = None
+    processing_message = None
     
     try:
-        available_id = await find_available_id()
-        processing_message = await message.reply("<ᴘʀᴏᴄᴇꜱꜱɪɴɢ>....")
-        
-        # Download the file
-        path = await reply.download()
-        
-        # Check file size
-        check_file_size(path)
+        processing_message = await message.reply(PROCESSING_TEXT)
         
+        media = reply.photo or reply.document
+        available_id = await find_available_id()
+
+        # Send character details to the channel
+        caption = character_caption(
+            "🌟 **Character Detail** 🌟", character_name, anime, available_id, rarity_text,
+            "Added", message.from_user
+        )
+
+        if reply.photo:
+            # Post the photo by file_id while it is downloaded and hosted
+            # (unless this exact media was hosted before)
+            hosted, tempo = await asyncio.gather(
+                host_reply_media(reply),
+                client.send_photo(chat_id=CHARA_CHANNEL_ID, photo=media.file_id, caption=caption),
+                return_exceptions=True
+            )
+            if isinstance(hosted, Exception):
+                # Withdraw the channel post, the character is not being added
+                if not isinstance(tempo, Exception):
+                    await withdraw_post(tempo)
+                raise hosted
+            image_url, path = hosted
+            if isinstance(tempo, Exception):
+                raise tempo
+        else:
+            # A document file_id can't be sent as a photo or video, so post the
+            # hosted URL once it exists (local file as fallback)
+            image_url, path = await host_reply_media(reply)
+            tempo = await send_to_channel(
+                client, CHARA_CHANNEL_ID, image_url, path or media.file_id, is_video_media(media), caption
+            )
+
         # Prepare character data
         character = {
             'name': character_name,
@@ -306,104 +552,83 @@ async def ul(client, message):
             'rarity': rarity_text,
             'id': available_id,
             'slock': "false",
-            'added': message.from_user.id
+            'added': message.from_user.id,
+            'img_url': image_url,
         }
 
-        # Upload image with fallback (imgBB as primary)
-        image_url = await upload_image_with_fallback(path)
-        character['img_url'] = image_url
-        
-        # Insert character into the database
-        await collection.insert_one(character)
-
-        # Send character details to the channel
-        caption = (
-            f"🌟 **Character Detail** 🌟\n"
-            f"\n━━━━━━━━━━━━━━━━━━\n"
-            f"🔹 **Name:** {character_name}\n"
-            f"🔸 **Anime:** {anime}\n"
-            f"🔹 **ID:** {available_id}\n"
-            f"🔸 **Rarity:** {rarity_text}\n"
-            f"Added by [{message.from_user.first_name}](tg://user?id={message.from_user.id})\n"
-            f"\n━━━━━━━━━━━━━━━━━━\n"
+        inserted, pinned = await asyncio.gather(
+            collection.insert_one(character), tempo.pin(), return_exceptions=True
         )
+        if isinstance(inserted, Exception):
+            # The character was never stored, take its post down again
+            # (deleting the message also drops the pin)
+            await withdraw_post(tempo)
+            raise inserted
+        if isinstance(pinned, Exception):
+            # The character is stored and posted, a missing pin isn't a failed upload
+            LOGGER.warning("Failed to pin the post for character %s: %s", available_id, pinned)
         
-        # Try to send with the uploaded URL first
-        try:
-            if path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.gif')):
-                tempo = await client.send_video(
-                    chat_id=CHARA_CHANNEL_ID,
-                    video=image_url,
-                    caption=caption,
-                )
-            else:
-                tempo = await client.send_photo(
-                    chat_id=CHARA_CHANNEL_ID,
-                    photo=image_url,
-                    caption=caption,
-                )
-        except:
-            # Fallback to sending the local file if URL doesn't work
-            if path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.gif')):
-                tempo = await client.send_video(
-                    chat_id=CHARA_CHANNEL_ID,
-                    video=path,
-                    caption=caption,
-                )
-            else:
-                tempo = await client.send_photo(
-                    chat_id=CHARA_CHANNEL_ID,
-                    photo=path,
-                    caption=caption,
-                )
-            
-        await tempo.pin()
-        
-        await message.reply_text(f'✅ CHARACTER ADDED SUCCESSFULLY! ID: {available_id}')
+        await processing_message.edit_text(f'✅ CHARACTER ADDED SUCCESSFULLY! ID: {available_id}')
         await client.send_message(chat_id=CHARA_CHANNEL_ID, text=f' @naruto_dev `/sendone {available_id}')
         
     except Exception as e:
-        error_msg = f"❌ Character Upload Unsuccessful. Error: {str(e)}"
-        await message.reply_text(error_msg)
-        print(error_msg)  # Log the error for debugging
+        error_msg = UPLOAD_FAILED_TEXT + str(e)
+        if processing_message:
+            await processing_message.edit_text(error_msg)
+        else:
+            await message.reply_text(error_msg)
+        LOGGER.exception(error_msg)
     
     finally:
         # Clean up
-        if 'path' in locals() and os.path.exists(path):
-            os.remove(path)
+        if 'path' in locals():
+            await remove_file(path)
         if available_id:
             async with id_lock:
                 active_ids.discard(available_id)
 
 @app.on_message(filters.command('delete') & sudo_filter)
 async def delete(client: Client, message: Message):
-    args = message.text.split(maxsplit=1)[1:]
-    if len(args) != 1:
-        await message.reply_text('Incorrect format... Please use: /delete ID')
+    character_ids = message.command[1:]
+    if not character_ids:
+        await message.reply_text('Incorrect format... Please use: /delete ID [ID ...]')
         return
 
-    character_id = args[0]
-    character = await collection.find_one_and_delete({'id': character_id})
+    if len(character_ids) == 1:
+        # Only existence matters, the deleted count answers that without a read
+        result = await delete_collection.delete_one({'id': character_ids[0]})
+        found_ids = character_ids if result.deleted_count else []
+    else:
+        # Resolve which IDs exist, then remove them all in one command
+        found_ids = await collection.distinct('id', {'id': {'$in': character_ids}})
+        if found_ids:
+            await delete_collection.delete_many({'id': {'$in': found_ids}})
    
-    if character:
-        bulk_operations = []
-        async for user in user_collection.find():
-            if 'characters' in user:
-                user['characters'] = [char for char in user['characters'] if char['id'] != character_id]
-                bulk_operations.append(
-                    UpdateOne({'_id': user['_id']}, {'$set': {'characters': user['characters']}})
-                )
-
-        if bulk_operations:
-            await user_collection.bulk_write(bulk_operations)
-
-        await message.reply_text('Character deleted from database and all user collections.')
+    if found_ids:
+        for character_id in found_ids:
+            character_cache.pop(character_id, None)
+
+        # Pull every copy of the characters server-side in a single command
+        await delete_user_collection.update_many(
+            {'characters.id': {'$in': found_ids}},
+            {'$pull': {'characters': {'id': {'$in': found_ids}}}}
+        )
+
+        missing_ids = [character_id for character_id in character_ids if character_id not in found_ids]
+        if missing_ids:
+            await message.reply_text(
+                f'Deleted {len(found_ids)} character(s) from database and all user collections.\n'
+                f'Not found: {", ".join(missing_ids)}'
+            )
+        else:
+            await message.reply_text('Character deleted from database and all user collections.')
     else:
         await message.reply_text('Character not found in database.')
 
 async def check_total_characters(update: Update, context: CallbackContext) -> None:
     try:
-        total_characters = await collection.count_documents({})
+        # Collection metadata count, avoids scanning every document
+        total_characters = await collection.estimated_document_count()
         await update.message.reply_text(f"Total number of characters: {total_characters}")
     except Exception as e:
         await update.message.reply_text(f"Error occurred: {e}")
@@ -416,7 +641,7 @@ async def check(update: Update, context: CallbackContext) -> None:
             return
             
         character_id = context.args[0]
-        character = await collection.find_one({'id': args[0]}) 
+        character = await collection.find_one({'id': args[0]}, CHECK_PROJECTION)
             
         if character:
             # If character found, send the information along with the image URL
@@ -440,7 +665,11 @@ async def check(update: Update, context: CallbackContext) -> None:
     except Exception as e:
         await update.message.reply_text(f"Error occurred: {e}")
 
-application.add_handler(CommandHandler("total", check_total_characters))
+CHECK_HANDLER = CommandHandler('f', check, block=False)
+application.add_handlers([
+    CommandHandler("total", check_total_characters),
+    CHECK_HANDLER,
+])
 
 @app.on_message(filters.command('update') & uploader_filter)
 async def update(client: Client, message: Message):
@@ -453,39 +682,28 @@ async def update(client: Client, message: Message):
     field = args[1]
     new_value = args[2]
 
-    character = await collection.find_one({'id': character_id})
-    if not character:
-        await message.reply_text('Character not found.')
-        return
-
     valid_fields = ['img_url', 'name', 'anime', 'rarity']
     if field not in valid_fields:
         await message.reply_text(f'Invalid field. Please use one of the following: {", ".join(valid_fields)}')
         return
 
     if field in ['name', 'anime']:
-        new_value = new_value.replace('-', ' ').title()
+        new_value = normalize_name(new_value)
     elif field == 'rarity':
-        try:
-            new_value = RARITY_MAP[int(new_value)][1]  # Get the text from tuple
-        except KeyError:
-            await message.reply_text('Invalid rarity. Please use a number between 1 and 15.')
+        new_value = RARITY_TEXT_BY_ARG.get(new_value)
+        if new_value is None:
+            await message.reply_text(INVALID_RARITY_TEXT)
             return
 
-    await collection.update_one({'id': character_id}, {'$set': {field: new_value}})
+    # Single atomic write; only matches when the value actually changes
+    if not await set_character_field(character_id, field, new_value):
+        if await character_exists(character_id):
+            await message.reply_text('No changes: the character already has this value.')
+        else:
+            await message.reply_text(CHARACTER_NOT_FOUND_TEXT)
+        return
     
-    bulk_operations = []
-    async for user in user_collection.find():
-        if 'characters' in user:
-            for char in user['characters']:
-                if char['id'] == character_id:
-                    char[field] = new_value
-            bulk_operations.append(
-                UpdateOne({'_id': user['_id']}, {'$set': {'characters': user['characters']}})
-            )
-
-    if bulk_operations:
-        await user_collection.bulk_write(bulk_operations)
+    await update_user_characters(character_id, {field: new_value})
 
     await message.reply_text('Update done in Database and all user collections.')
 
@@ -499,37 +717,27 @@ async def update_rarity(client: Client, message: Message):
     character_id = args[0]
     new_rarity = args[1]
 
-    character = await collection.find_one({'id': character_id})
-    if not character:
-        await message.reply_text('Character not found.')
+    new_rarity_value = RARITY_TEXT_BY_ARG.get(new_rarity)
+    if new_rarity_value is None:
+        await message.reply_text(INVALID_RARITY_TEXT)
         return
 
-    try:
-        new_rarity_value = RARITY_MAP[int(new_rarity)][1]  # Get the text from tuple
-    except KeyError:
-        await message.reply_text('Invalid rarity. Please use a number between 1 and 15.')
+    # Single atomic write; only matches when the rarity actually changes
+    if not await set_character_field(character_id, 'rarity', new_rarity_value):
+        if await character_exists(character_id):
+            await message.reply_text('No changes: the character already has this rarity.')
+        else:
+            await message.reply_text(CHARACTER_NOT_FOUND_TEXT)
         return
 
-    await collection.update_one({'id': character_id}, {'$set': {'rarity': new_rarity_value}})
-
-    bulk_operations = []
-    async for user in user_collection.find():
-        if 'characters' in user:
-            for char in user['characters']:
-                if char['id'] == character_id:
-                    char['rarity'] = new_rarity_value
-            bulk_operations.append(
-                UpdateOne({'_id': user['_id']}, {'$set': {'characters': user['characters']}})
-            )
-
-    if bulk_operations:
-        await user_collection.bulk_write(bulk_operations)
+    await update_user_characters(character_id, {'rarity': new_rarity_value})
 
     await message.reply_text('Rarity updated in Database and all user collections.')
 
 @app.on_message(filters.command('arrange') & sudo_filter)
 async def arrange_characters(client: Client, message: Message):
-    characters = await collection.find().sort('id', 1).to_list(length=None)
+    # Renumbering only needs each document's key and current ID
+    characters = await collection.find({}, {'_id': 1, 'id': 1}).sort('id', 1).to_list(length=None)
     if not characters:
         await message.reply_text('No characters found in the database.')
         return
@@ -549,11 +757,14 @@ async def arrange_characters(client: Client, message: Message):
             )
         new_id_counter += 1
 
+    # Each op targets its own _id, so the server may apply them in any order
     if bulk_operations:
-        await collection.bulk_write(bulk_operations)
+        await collection.bulk_write(bulk_operations, ordered=False)
+        # IDs were reassigned, every cached entry is stale
+        character_cache.clear()
 
     user_bulk_operations = []
-    async for user in user_collection.find():
+    async for user in user_collection.find({'characters': {'$exists': True}}, {'characters': 1}):
         if 'characters' in user:
             for char in user['characters']:
                 if char['id'] in old_to_new_id_map:
@@ -563,13 +774,10 @@ async def arrange_characters(client: Client, message: Message):
             )
 
     if user_bulk_operations:
-        await user_collection.bulk_write(user_bulk_operations)
+        await user_collection.bulk_write(user_bulk_operations, ordered=False)
 
     await message.reply_text('Characters have been rearranged and IDs updated successfully.')
 
-CHECK_HANDLER = CommandHandler('f', check, block=False)
-application.add_handler(CHECK_HANDLER)
-
 @shivuu.on_message(filters.command("vadd") & uploader_filter)
 async def upload_video_character(client, message):
     args = message.text.split(maxsplit=3)
@@ -577,8 +785,8 @@ async def upload_video_character(client, message):
         await message.reply_text("Wrong format. Use: /vadd character-name anime-name video-url")
         return
 
-    character_name = args[1].replace('-', ' ').title()
-    anime = args[2].replace('-', ' ').title()
+    character_name = normalize_name(args[1])
+    anime = normalize_name(args[2])
     vid_url = args[3]
 
     # Generate the next available ID
@@ -587,7 +795,7 @@ async def upload_video_character(client, message):
     character = {
         'name': character_name,
         'anime': anime,
-        'rarity': "🎗️ 𝘼𝙈𝙑 𝙀𝙙𝙞𝙩𝙞𝙤𝙣",
+        'rarity': AMV_RARITY,
         'id': available_id,
         'vid_url': vid_url,
         'slock': "false",
@@ -603,7 +811,7 @@ async def upload_video_character(client, message):
                 f"🎥 **New Character Added** 🎥\n\n"
                 f"Character Name: {character_name}\n"
                 f"Anime Name: {anime}\n"
-                f"Rarity: '🎗️ 𝘼𝙈𝙑 𝙀𝙙𝙞𝙩𝙞𝙤𝙣'\n"
+                f"Rarity: '{AMV_RARITY}'\n"
                 f"ID: {available_id}\n"
                 f"Added by [{message.from_user.first_name}](tg://user?id={message.from_user.id})"
             ),
@@ -612,9 +820,9 @@ async def upload_video_character(client, message):
         # Insert the character data into MongoDB
         await collection.insert_one(character)
 
-        await message.reply_text("✅ Video character added successfully.")
+        await message.reply_text(VIDEO_ADDED_TEXT)
     except Exception as e:
-        await message.reply_text(f"❌ Failed to upload character. Error: {e}")
+        await message.reply_text(VIDEO_UPLOAD_FAILED_TEXT + str(e))
 
 
 
@@ -629,7 +837,8 @@ async def update_image(client, message):
         await message.reply_text("Please reply to a photo or document with this command.")
         return
         
-    args = message.text.split()
+    # Arguments are already parsed by the command filter
+    args = message.command
     if len(args) != 2:
         await message.reply_text("Wrong format. Use: /updateimg [character_id] (reply to image)")
         return
@@ -637,93 +846,52 @@ async def update_image(client, message):
     character_id = args[1]
     
     # Check if character exists
-    character = await collection.find_one({'id': character_id})
+    character = await get_character(character_id)
     if not character:
         await message.reply_text(f"Character with ID {character_id} not found.")
         return
     
+    processing_message = None
     try:
-        processing_message = await message.reply("<ᴜᴘᴅᴀᴛɪɴɢ ɪᴍᴀɢᴇ...>")
+        processing_message = await message.reply(UPDATING_IMAGE_TEXT)
         
-        # Download the new image
-        path = await reply.download()
-        
-        # Check file size
-        check_file_size(path)
-        
-        # Upload image with fallback (imgBB as primary)
-        image_url = await upload_image_with_fallback(path)
+        # Download and host the new image, unless this exact media was hosted before
+        media = reply.photo or reply.document
+        image_url, path = await host_reply_media(reply)
         
         # Update character in the database
         await collection.update_one(
             {'id': character_id}, 
             {'$set': {'img_url': image_url}}
         )
+        character_cache.pop(character_id, None)
         
         # Update all user collections that have this character
-        bulk_operations = []
-        async for user in user_collection.find():
-            if 'characters' in user:
-                for char in user['characters']:
-                    if char['id'] == character_id:
-                        char['img_url'] = image_url
-                bulk_operations.append(
-                    UpdateOne({'_id': user['_id']}, {'$set': {'characters': user['characters']}})
-                )
-
-        if bulk_operations:
-            await user_collection.bulk_write(bulk_operations)
+        await update_user_characters(character_id, {'img_url': image_url})
         
-        # Send confirmation message
-        await message.reply_text(f'✅ Image updated successfully for character ID: {character_id}')
-        
-        # Send updated character info to channel
-        caption = (
-            f"🔄 **Character Image Updated** 🔄\n"
-            f"\n━━━━━━━━━━━━━━━━━━\n"
-            f"🔹 **Name:** {character['name']}\n"
-            f"🔸 **Anime:** {character['anime']}\n"
-            f"🔹 **ID:** {character_id}\n"
-            f"🔸 **Rarity:** {character['rarity']}\n"
-            f"Image updated by [{message.from_user.first_name}](tg://user?id={message.from_user.id})\n"
-            f"\n━━━━━━━━━━━━━━━━━━\n"
+        # Updated character info for the channel post
+        caption = character_caption(
+            "🔄 **Character Image Updated** 🔄", character['name'], character['anime'], character_id,
+            character['rarity'], "Image updated", message.from_user
         )
         
-        # Try to send with the uploaded URL
-        try:
-            if path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.gif')):
-                await client.send_video(
-                    chat_id-1003295207951,
-                    video=image_url,
-                    caption=caption,
-                )
-            else:
-                await client.send_photo(
-                    chat_id=-1003295207951,
-                    photo=image_url,
-                    caption=caption,
-                )
-        except:
-            # Fallback to sending the local file if URL doesn't work
-            if path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.gif')):
-                await client.send_video(
-                    chat_id=-1003295207951,
-                    video=path,
-                    caption=caption,
-                )
-            else:
-                await client.send_photo(
-                    chat_id=-1003295207951,
-                    photo=path,
-                    caption=caption,
-                )
+        # Send confirmation message
+        await processing_message.edit_text(f'✅ Image updated successfully for character ID: {character_id}')
+        
+        # The channel post doesn't change the result, finish it in the background;
+        # it takes over removing the downloaded file
+        create_background_task(post_image_update(client, image_url, path, media, caption))
+        path = None
                 
     except Exception as e:
-        error_msg = f"❌ Image update failed. Error: {str(e)}"
-        await message.reply_text(error_msg)
-        print(error_msg)  # Log the error for debugging
+        error_msg = IMAGE_UPDATE_FAILED_TEXT + str(e)
+        if processing_message:
+            await processing_message.edit_text(error_msg)
+        else:
+            await message.reply_text(error_msg)
+        LOGGER.exception(error_msg)
     
     finally:
         # Clean up
-        if 'path' in locals() and os.path.exists(path):
-            os.remove(path)
+        if 'path' in locals():
+            await remove_file(path)